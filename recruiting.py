@@ -6,40 +6,175 @@ to create a CSV file suitable for recruitment analysis.
 
 The scraper:
 1. Fetches a main results page containing links to individual events
-2. For each event, retrieves JSON data with race results
+2. For each event, retrieves JSON data with race results (in parallel)
 3. Fetches athlete lineups (in parallel) for each boat in the races
 4. Aggregates race data by athlete name
 5. Exports flattened athlete data to CSV format
 
 Typical usage:
-    python recruiting.py
+    python recruiting.py [--refresh]
 
 This will generate an 'athletes.csv' file containing all scraped athlete race data.
+Progress is logged at INFO level; set LOG_LEVEL=DEBUG to also log every athlete's races.
+Set SCRAPER_EVENT_WORKERS and SCRAPER_LINEUP_WORKERS to control how many events and
+boat lineups are fetched concurrently (SCRAPER_EVENT_WORKERS=1 restores sequential
+event fetching), and SCRAPER_EVENT_RATE / SCRAPER_LINEUP_RATE to cap requests per second
+(0 disables the cap).
+Responses are cached under SCRAPER_CACHE_DIR (default .cache) for SCRAPER_CACHE_MAX_AGE
+seconds (default one day); pass --refresh to ignore the cache.
 """
 
+import argparse
 import cloudscraper
+from cloudscraper import CipherSuiteAdapter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
-import json
-from collections import defaultdict
-from bs4 import BeautifulSoup
+import orjson
+import soupsieve
+from collections import deque
+from dataclasses import dataclass, field
+from bs4 import BeautifulSoup, SoupStrainer
 import concurrent.futures
 import csv
+import functools
+import itertools
+import logging
+import operator
+import os
+import threading
 import time
+import unicodedata
+from pathlib import Path
+from html import unescape
+from types import MappingProxyType
+from urllib.parse import parse_qs, urlparse
 from nameparser import HumanName
 
+logger = logging.getLogger("recruiting")
+
+# Number of events fetched concurrently; set SCRAPER_EVENT_WORKERS=1 for sequential fetching
+event_workers = max(1, int(os.environ.get("SCRAPER_EVENT_WORKERS", "8")))
+
+# Number of boat lineups fetched concurrently across all events
+lineup_workers = max(1, int(os.environ.get("SCRAPER_LINEUP_WORKERS", "16")))
+
 # Create a cloudscraper instance to bypass Cloudflare protection
 scraper = cloudscraper.create_scraper()
 
+# Size the connection pool to the total number of workers so every concurrent request
+# reuses a kept-alive connection instead of opening a new TCP + TLS connection;
+# urllib3 drops connections that are returned to an already full pool.
+# 503 is left out of the retried statuses because cloudscraper relies on seeing it
+# to detect and solve Cloudflare challenges. 429 responses wait out the server's
+# Retry-After header before the next attempt. This is the only retry layer: retried
+# requests are spaced by the backoff rather than counted again by the rate limiters.
+# The exponential backoff gets up to 0.5s of random jitter so workers that failed
+# together do not retry in lockstep.
+_retry = Retry(
+    total=3,
+    backoff_factor=0.5,
+    backoff_jitter=0.5,
+    status_forcelist=[429, 500, 502, 504],
+    respect_retry_after_header=True,
+)
+_pool_size = event_workers + lineup_workers
+scraper.mount(
+    "https://",
+    CipherSuiteAdapter(
+        cipherSuite=scraper.cipherSuite,
+        ecdhCurve=scraper.ecdhCurve,
+        server_hostname=scraper.server_hostname,
+        source_address=scraper.source_address,
+        ssl_context=scraper.ssl_context,
+        pool_maxsize=_pool_size,
+        max_retries=_retry,
+    ),
+)
+scraper.mount("http://", HTTPAdapter(pool_maxsize=_pool_size, max_retries=_retry))
+scraper.headers["Connection"] = "keep-alive"
+
 base_url = "https://www.regattacentral.com"
 main_results_url = "https://www.regattacentral.com/regatta/results2?job_id=9168"
 
+# Servlet endpoints for per-event results and per-boat lineups
+_EVENT_RESULTS_URL = base_url + "/servlet/DisplayRacesResults?Method=getResults&job_id={job_id}&event_id={event_id}"
+_LINEUP_URL = base_url + "/servlet/LineupServlet?Method=getLineupHtml&job_id={job_id}&boat_id={boat_id}"
+
+# CSS selectors for the regatta header, compiled once instead of on every lookup
+_HEADER_SEL = soupsieve.compile(".rc-regatta-header")
+_HEADER_TEXT_SELS = (
+    ("name", soupsieve.compile("h2[itemprop='name']")),
+    ("start_date", soupsieve.compile("span[itemprop='startDate']")),
+    ("end_date", soupsieve.compile("span[itemprop='endDate']")),
+    ("location", soupsieve.compile("li[itemprop='location']")),
+    ("venue", soupsieve.compile("a[href*='/venues/venue.jsp']")),
+)
+_DETAILS_SEL = soupsieve.compile(".rc-regatta-details li")
+_DETAILS2_SEL = soupsieve.compile(".rc-regatta-details-2 li")
+_STAT_SEL = soupsieve.compile(".rc-regatta-stat")
+_STAT_VALUE_SEL = soupsieve.compile("span[itemprop='value']")
+_STAT_LABEL_SEL = soupsieve.compile("h4")
+
+# Race types recognized in the regatta header details list
+_RACE_TYPES = frozenset(("sprint", "head", "dual"))
+
+# Only the regatta header and the event result anchors are needed from the main results page
+# (matched as a class token, since the header div also carries other classes)
+_REGATTA_HEADER_STRAINER = SoupStrainer(class_=re.compile(r"(?:^|\s)rc-regatta-header(?:\s|$)"))
+_EVENT_LINK_STRAINER = SoupStrainer("a", href=re.compile(r"^/regatta/results2/eventResults\.jsp"))
+
+# Lineup line pattern: "1: John Doe - 18 (Rowing Club)". It runs on the raw HTML bytes,
+# so a line must start a text node or a new line and may not cross a tag or line break.
+# Whitespace between the fields may also be a non-breaking space, either as an entity
+# or as the raw character, which the text the entities decode to would contain. The raw
+# character is encoded differently in UTF-8 and single-byte (ISO-8859-1/cp1252) bodies,
+# so there is one pattern per kind of body.
+def _lineup_pattern(nbsp):
+    ws = rb"(?:[^\S\n]|&nbsp;|&#160;|&#[xX][aA]0;|" + nbsp + rb")*"
+    return re.compile(
+        rb"(?m)(?:^|(?<=>))" + ws + rb"(\d+):" + ws + rb"([^<\r\n]+?)" + ws
+        + rb"-" + ws + rb"(\d+)" + ws + rb"\(([^<\r\n]+?)\)"
+    )
+
+
+_LINEUP_RE = _lineup_pattern(b"\xc2\xa0")
+_LINEUP_LEGACY_RE = _lineup_pattern(b"\xa0")
+
+# Event results are a JSON object; this cheaply tells them apart from an HTML error
+# page without parsing the whole body a second time
+_JSON_OBJECT_RE = re.compile(rb"\s*\{")
+
+# RegattaCentral's results schema varies between regattas, so each value is read from
+# the first of these fields that is set
+_RACE_NAME_FIELDS = ("stageName", "displayNumber", "raceName")
+_CLUB_FIELDS = ("orgName", "longName")
+_PLACE_FIELDS = ("place", "orderOfFinishPlace", "finishPlace", "officialPlace")
+_FINISH_FIELDS = ("finishTimeString", "adjustedTimeString", "rawTimeString", "officialTimeString")
+_MARGIN_FIELDS = ("marginString", "adjustedTimeDeltaString", "officialMarginString")
+
+# Raw event JSON and lineup HTML are cached here so reruns skip the network
+cache_dir = Path(os.environ.get("SCRAPER_CACHE_DIR", ".cache"))
+
+# Cached responses older than this many seconds are fetched again, so results from a
+# regatta that is still running (finals posted after the heats) do not go stale
+cache_max_age = float(os.environ.get("SCRAPER_CACHE_MAX_AGE", "86400"))
 
+# When set (python recruiting.py --refresh), cached responses are ignored and overwritten
+refresh_cache = False
+
+# Shared pool for lineup fetches so lineups from different events can overlap
+_LINEUP_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=lineup_workers)
+
+
+@functools.lru_cache(maxsize=4096)
 def normalize_name(name):
     """Normalize an athlete's name using HumanName parser.
     
     Parses a name string into components and extracts only the first and last name.
     This allows matching the same person across multiple entries where their name
     might be formatted differently (e.g., with initials, middle names, suffixes, etc.).
+    Results are memoized because the same raw name recurs in every race an athlete rows.
     
     The normalized form is "FirstName LastName" which is used as the aggregation key.
     This ensures that "John Smith", "J. Smith", and "John Q. Smith" all map to the
@@ -70,6 +205,42 @@ def normalize_name(name):
         return name.strip()
 
 
+def athlete_key(name):
+    """Build the aggregation key for a normalized athlete name.
+    
+    Folds case and strips accents so that "John DOE", "John Doe" and "Jöhn Doe"
+    are grouped as the same athlete. The key is only used for grouping; the
+    readable name is kept on the Athlete record.
+    
+    Args:
+        name (str): Name as returned by normalize_name()
+        
+    Returns:
+        str: Case- and accent-insensitive grouping key
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+@dataclass(slots=True)
+class Athlete:
+    """Aggregated race history for a single athlete.
+    
+    Attributes:
+        name (str): Display name in "FirstName LastName" format (first variant seen)
+        age (str): The athlete's age, taken from their most recent lineup entry
+        races (list): List of race results for this athlete
+        clubs (set): Set of clubs the athlete competed for
+        names (set): Set of raw name variations seen for this athlete (for reference)
+    """
+    name: str = ""
+    age: str = ""
+    races: list = field(default_factory=list)
+    clubs: set = field(default_factory=set)
+    names: set = field(default_factory=set)
+
+
 def get_regatta_metadata(html):
     """Extract regatta metadata from the main results page HTML.
     
@@ -92,7 +263,7 @@ def get_regatta_metadata(html):
               - entries (str): Number of entries
               - clubs (str): Number of participating clubs
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml", parse_only=_REGATTA_HEADER_STRAINER)
     metadata = {
         "name": "",
         "start_date": "",
@@ -107,56 +278,38 @@ def get_regatta_metadata(html):
     }
     
     # Find the regatta header
-    header = soup.select_one(".rc-regatta-header")
+    header = _HEADER_SEL.select_one(soup)
     if not header:
         return metadata
     
-    # Get regatta name from h2
-    name_el = header.select_one("h2[itemprop='name']")
-    if name_el:
-        metadata["name"] = name_el.get_text(strip=True)
-    
-    # Get dates
-    start_date = header.select_one("span[itemprop='startDate']")
-    if start_date:
-        metadata["start_date"] = start_date.get_text(strip=True)
-    
-    end_date = header.select_one("span[itemprop='endDate']")
-    if end_date:
-        metadata["end_date"] = end_date.get_text(strip=True)
-    
-    # Get location
-    location_el = header.select_one("li[itemprop='location']")
-    if location_el:
-        metadata["location"] = location_el.get_text(strip=True)
-    
-    # Get venue (from the link to venue page)
-    venue_link = header.select_one("a[href*='/venues/venue.jsp']")
-    if venue_link:
-        metadata["venue"] = venue_link.get_text(strip=True)
+    # Get name, dates, location and venue (from the link to the venue page)
+    for key, selector in _HEADER_TEXT_SELS:
+        el = selector.select_one(header)
+        if el:
+            metadata[key] = el.get_text(strip=True)
     
     # Parse the details lists
-    details = header.select(".rc-regatta-details li")
+    details = _DETAILS_SEL.select(header)
     for li in details:
-        text = li.get_text(strip=True)
+        text = li.get_text(strip=True).lower()
         # Check for race type (sprint, head, etc.)
-        if text.lower() in ["sprint", "head", "dual"]:
-            metadata["race_type"] = text.lower()
+        if text in _RACE_TYPES:
+            metadata["race_type"] = text
     
     # Get host from the second details list
-    details2 = header.select(".rc-regatta-details-2 li")
+    details2 = _DETAILS2_SEL.select(header)
     for li in details2:
         text = li.get_text(strip=True)
         if text.startswith("Hosted By:"):
-            metadata["host"] = text.replace("Hosted By:", "").strip()
+            metadata["host"] = text.removeprefix("Hosted By:").strip()
         if "USRowing Sanctioned" in text:
             metadata["sanctioned"] = True
     
     # Get stats (entries and clubs)
-    stats = header.select(".rc-regatta-stat")
+    stats = _STAT_SEL.select(header)
     for stat in stats:
-        value_el = stat.select_one("span[itemprop='value']")
-        h4_el = stat.select_one("h4")
+        value_el = _STAT_VALUE_SEL.select_one(stat)
+        h4_el = _STAT_LABEL_SEL.select_one(stat)
         if value_el and h4_el:
             label = h4_el.get_text(strip=True).lower()
             value = value_el.get_text(strip=True)
@@ -173,79 +326,209 @@ def get_event_links(html):
     """Extract event result links from the main results page HTML.
     
     Parses the HTML to find all anchor tags that link to individual event results,
-    converts relative URLs to absolute URLs.
+    converts relative URLs to absolute URLs, and reads the job and event IDs from
+    each link's query string. Links missing either ID are skipped.
     
     Args:
         html (str): HTML content of the main results page
         
     Returns:
-        list: Absolute URLs to individual event result pages
+        list: (job_id, event_id, url) tuples, where url is the absolute URL to the
+              event result page
     """
-    soup = BeautifulSoup(html, "html.parser")
+    soup = BeautifulSoup(html, "lxml", parse_only=_EVENT_LINK_STRAINER)
     event_links = []
-    for a in soup.select('a[href^="/regatta/results2/eventResults.jsp"]'):
+    for a in soup.find_all("a"):
         href = a.get("href")
         if href.startswith("/"):
             href = base_url + href
-        event_links.append(href)
+        query = parse_qs(urlparse(href).query)
+        if "job_id" in query and "event_id" in query:
+            event_links.append((query["job_id"][0], query["event_id"][0], href))
     return event_links
 
 
+class RateLimiter:
+    """Thread-safe sliding-window limit on how often requests are sent.
+    
+    Allows at most `rate` calls to acquire() in any `period` seconds, across all
+    threads sharing the limiter. Callers over the limit block until the oldest call
+    in the window expires, so parallel workers stay polite without a fixed sleep
+    between every request. Fractional rates are honoured by widening the window
+    (a rate of 0.5 allows one call every 2 seconds); a rate of 0 or less disables
+    the limit.
+    
+    Args:
+        rate (float): Maximum number of calls per period
+        period (float, optional): Window length in seconds. Defaults to 1.0
+    """
+
+    def __init__(self, rate, period=1.0):
+        self.rate = rate
+        # Track a whole number of calls, stretching the window to keep the same rate
+        self._max_calls = max(1, int(rate))
+        self.period = period * self._max_calls / rate if rate > 0 else period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until another request may be sent, then record it."""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                # Forget calls that have left the window
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self._max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
+
+
+# Cap requests per second across all event workers and all lineup workers respectively
+event_rate_limiter = RateLimiter(float(os.environ.get("SCRAPER_EVENT_RATE", "4")))
+lineup_rate_limiter = RateLimiter(float(os.environ.get("SCRAPER_LINEUP_RATE", "20")))
+
+
+def _cached(path, fetch_fn, validate=None):
+    """Return the contents of a cache file, fetching and storing it on a miss.
+    
+    Only truthy results that pass validate are written, so failed requests and
+    error pages served with HTTP 200 are retried on the next run.
+    Existing entries are ignored (and replaced) when refresh_cache is set or when they
+    are older than cache_max_age seconds.
+    The file is written to a temporary name first so concurrent workers never read
+    a partially written entry.
+    
+    Args:
+        path (Path): Cache file location
+        fetch_fn (callable): Zero-argument function returning the bytes to cache, or None
+        validate (callable, optional): Called with freshly fetched bytes; they are only
+                                       cached if it returns a truthy value
+        
+    Returns:
+        bytes: Cached or freshly fetched response body, or None if the fetch failed
+    """
+    if not refresh_cache:
+        try:
+            if time.time() - path.stat().st_mtime < cache_max_age:
+                return path.read_bytes()
+        except FileNotFoundError:
+            pass
+    data = fetch_fn()
+    if data and (validate is None or validate(data)):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    return data
+
+
 def fetch_event_results_json(job_id, event_id):
     """Fetch JSON race results for a specific event from RegattaCentral.
     
     Makes an HTTP request to the DisplayRacesResults servlet with the specified
-    job and event IDs. Includes error handling for network failures.
+    job and event IDs, unless the response is already in the on-disk cache.
+    Transient failures are retried by the session's Retry policy; anything still
+    failing is logged and reported as None.
     
     Args:
         job_id (str): The RegattaCentral job ID for the event
         event_id (str): The RegattaCentral event ID
         
     Returns:
-        str: JSON string containing race results, or None if the request fails
+        bytes: Raw response body (normally JSON race results), or None if the request fails
     """
-    url = f"https://www.regattacentral.com/servlet/DisplayRacesResults?Method=getResults&job_id={job_id}&event_id={event_id}"
-    try:
+    url = _EVENT_RESULTS_URL.format(job_id=job_id, event_id=event_id)
+
+    def fetch():
+        event_rate_limiter.acquire()
         resp = scraper.get(url, timeout=15)
         if resp.status_code == 200:
-            return resp.text
+            return resp.content
+        return None
+
+    try:
+        # An error or challenge page served with HTTP 200 is returned but not cached;
+        # parse_event_races() then rejects it for this run only
+        return _cached(cache_dir / "events" / f"{job_id}_{event_id}.json", fetch, _JSON_OBJECT_RE.match)
     except Exception as e:
-        print(f"Error fetching event results for job_id={job_id}, event_id={event_id}: {e}")
+        logger.warning("Error fetching event results for job_id=%s, event_id=%s: %s", job_id, event_id, e)
     return None
 
 
 def fetch_lineup(job_id, boat_id):
     """Fetch and parse the athlete lineup for a specific boat.
     
-    Retrieves the HTML lineup from RegattaCentral's LineupServlet and parses it
-    to extract athlete information (name, seat, age, club).
+    Retrieves the HTML lineup from RegattaCentral's LineupServlet (or the on-disk
+    cache) and parses it to extract athlete information (name, seat, age, club).
+    Successful lookups are memoized, so a boat that appears in several races or
+    events is only requested once per run.
     
     Args:
         job_id (str): The RegattaCentral job ID
         boat_id (str): The boat ID for which to fetch the lineup
         
     Returns:
-        list: List of athlete dictionaries with keys: seat, name, age, club.
-              Empty list if the request fails.
+        tuple: Read-only athlete mappings with keys: seat, name, age, club.
+               Empty tuple if the request fails.
+    """
+    return _fetch_lineup_with_clubs(job_id, boat_id)[0]
+
+
+def _fetch_lineup_with_clubs(job_id, boat_id):
+    """Like fetch_lineup(), but also return each athlete's lowercased club.
+    
+    Returns:
+        tuple: (lineup, clubs_lc), where clubs_lc holds the lowercased club of each
+               athlete in lineup, in the same order. Both are empty if the request fails.
     """
-    url = f"https://www.regattacentral.com/servlet/LineupServlet?Method=getLineupHtml&job_id={job_id}&boat_id={boat_id}"
     try:
+        return _fetch_lineup_memoized(job_id, boat_id)
+    except Exception as e:
+        logger.warning("Error fetching lineup for job_id=%s, boat_id=%s: %s", job_id, boat_id, e)
+    return (), ()
+
+
+@functools.lru_cache(maxsize=4096)
+def _fetch_lineup_memoized(job_id, boat_id):
+    """Memoized body of _fetch_lineup_with_clubs().
+    
+    Raises on failure rather than returning an empty lineup so that failed requests
+    are not memoized. The athlete mappings are read-only because every caller
+    shares the same cached tuple. The cache is bounded so a process that scrapes
+    several regattas does not keep every lineup it has seen.
+    """
+    url = _LINEUP_URL.format(job_id=job_id, boat_id=boat_id)
+
+    def fetch():
+        lineup_rate_limiter.acquire()
         resp = scraper.get(url, timeout=10)
         if resp.status_code == 200:
-            return parse_lineup_html(resp.text)
-    except Exception as e:
-        print(f"Error fetching lineup for job_id={job_id}, boat_id={boat_id}: {e}")
-    return []
+            return resp.content
+        raise RuntimeError(f"LineupServlet returned HTTP {resp.status_code}")
+
+    # A page without any lineup line (a placeholder or an error page) is used for this
+    # run but not cached, so a lineup published later is picked up
+    html = _cached(cache_dir / "lineups" / f"{job_id}_{boat_id}.html", fetch, _has_lineup)
+    lineup = tuple(MappingProxyType(a) for a in parse_lineup_html(html))
+    # Lowercase each club once here rather than once per race row the boat appears in
+    return lineup, tuple(a["club"].lower() for a in lineup)
 
 
 def parse_lineup_html(html):
     """
     Desc: 
         Parse HTML lineup data to extract athlete information.
-        Uses regex to extract athlete details from the LineupServlet HTML response.
+        Runs a regex directly over the raw LineupServlet HTML response instead of
+        building a parse tree; HTML entities are decoded in the captured fields only.
         Expected format: "seat: name - age (club)"
     Args:
-        html (str): HTML content from the LineupServlet response
+        html (bytes or str): HTML content from the LineupServlet response. Bytes are
+                             read as UTF-8, or as cp1252 if they are not valid UTF-8.
     Returns:
         list: List of dictionaries containing athlete information:
               - seat (str): The rower's seat position in the boat
@@ -253,144 +536,170 @@ def parse_lineup_html(html):
               - age (str): Athlete's age
               - club (str): Club/organization name
     """
-    soup = BeautifulSoup(html, "html.parser")
+    if isinstance(html, str):
+        html = html.encode("utf-8")
+    # Every lineup line has a "seat:" prefix; boats without a published lineup
+    # return a placeholder page, which this byte search rejects before the regex runs
+    if b":" not in html:
+        return []
+    pattern, encoding = _lineup_encoding(html)
     athletes = []
-    for line in soup.get_text(separator="\n").splitlines():
-        # Pattern: "1: John Doe - 18 (Rowing Club)"
-        m = re.match(r"(\d+):\s*(.+?)\s*-\s*(\d+)\s*\((.+?)\)", line.strip())
-        if m:
-            seat, name, age, club = m.groups()
-            athletes.append({
-                "seat": seat,
-                "name": name.strip(),
-                "age": age,
-                "club": club.strip(),
-            })
+    for seat, name, age, club in pattern.findall(html):
+        athletes.append({
+            "seat": seat.decode(),
+            "name": unescape(name.decode(encoding)).strip(),
+            "age": age.decode(),
+            "club": unescape(club.decode(encoding)).strip(),
+        })
     return athletes
 
-def parse_event_results_json(json_str, job_id=None, event_name=None):
-    """Parse JSON race results and associate athletes with race finishes.
+
+def _lineup_encoding(html):
+    """Return the lineup pattern and encoding to use for a LineupServlet body.
     
-    Processes event results JSON from RegattaCentral, extracts race information,
-    fetches athlete lineups in parallel, and combines them into result records.
-    Handles missing data gracefully by trying multiple field names for the same data.
+    LineupServlet bodies are usually UTF-8, but a Java servlet that does not set a
+    charset sends ISO-8859-1, so bodies that are not valid UTF-8 are read as cp1252
+    (a superset of ISO-8859-1's printable characters).
+    
+    Args:
+        html (bytes): Raw LineupServlet response body
+        
+    Returns:
+        tuple: (compiled pattern, encoding name)
+    """
+    if not html.isascii():
+        try:
+            html.decode("utf-8")
+        except UnicodeDecodeError:
+            return _LINEUP_LEGACY_RE, "cp1252"
+    return _LINEUP_RE, "utf-8"
+
+
+def _has_lineup(html):
+    """Return whether a LineupServlet body contains at least one lineup line."""
+    pattern, _ = _lineup_encoding(html)
+    return pattern.search(html) is not None
+
+
+def first_field(data, fields, default=""):
+    """Return the first truthy value among several candidate keys of a dictionary.
+    
+    Args:
+        data (dict): Dictionary to read from (e.g., a race or result from the JSON API)
+        fields (tuple): Keys to try, in order of preference
+        default (optional): Value returned when none of the keys is set. Defaults to ""
+        
+    Returns:
+        The first truthy value found, or default
+    """
+    for key in fields:
+        value = data.get(key)
+        if value:
+            return value
+    return default
+
+
+def parse_event_races(json_str, job_id=None, event_name=None, lineup_futures=None):
+    """Parse JSON race results and start fetching the athlete lineup for each boat.
+    
+    This is the first half of parse_event_results_json(). Lineup requests are submitted
+    to the shared lineup pool but not waited on, so the caller can queue up several
+    events before resolving any of them with build_event_results().
     
     Args:
-        json_str (str): JSON string containing race results from RegattaCentral
+        json_str (bytes or str): JSON race results from RegattaCentral
         job_id (str, optional): The job ID (used to fetch lineups)
         event_name (str, optional): Event name to use in results. If not provided,
                                     extracted from the JSON data.
+        lineup_futures (dict, optional): Lineup futures keyed by (job_id, boat_id).
+                                         Pass the same dict for every event so a boat
+                                         entered in several events is only submitted once.
         
     Returns:
-        list: List of race result dictionaries with keys:
-              - event (str): Event name
-              - race (str): Race name (e.g., 'Heat 1', 'Final')
-              - place (str): Finishing place
-              - bow (str): Boat lane/bow position
-              - club (str): Boat club/organization
-              - athletes (list): Athletes in the boat (with seat, name, age, club)
-              - finish (str): Finish time
-              - margin (str): Margin to next boat
-              - num_boats (int): Number of boats in the race
+        list: Pending race rows, one per boat result, for build_event_results().
+              Each row's "lineup" is a Future for the boat's (lineup, clubs_lc) pair
+              from _fetch_lineup_with_clubs(), or None when there is no lineup to fetch.
     """
-    data = json.loads(json_str)
+    data = orjson.loads(json_str)
     if not event_name:
         event_name = data.get("long_desc") or data.get("event_label") or ""
-    results = []
     races = data.get("races", [])
 
-    # Collect all unique (job_id, boat_id) pairs for lineup fetching
-    boat_ids = set()
+    if lineup_futures is None:
+        lineup_futures = {}
     race_rows = []
     for race in races:
         # Try multiple field names to find race name (API schema may vary)
-        race_name = (
-            race.get("stageName", "")
-            or race.get("displayNumber", "")
-            or race.get("raceName", "")
-            or "Final"
-        )
-
-        num_boats = 0
-        rows = []
+        race_name = first_field(race, _RACE_NAME_FIELDS, "Final")
+
+        results = race.get("results", [])
+        # Count the placed boats up front so each row is built complete in a single pass
+        places = [first_field(result, _PLACE_FIELDS) for result in results]
+        num_boats = sum(1 for place in places if place)
         # Process each boat's result in this race
-        for result in race.get("results", []):
-            boat_id = str(result.get("boatId")) if result.get("boatId") else None
+        for result, place in zip(results, places):
+            boat_id = result.get("boatId")
+            boat_id = str(boat_id) if boat_id else None
             boat_label = result.get("boatLabel") or ""
-            club_name = result.get("orgName") or result.get("longName") or ""
-            # Try multiple field names for finishing place
-            place = (
-                result.get("place")
-                or result.get("orderOfFinishPlace")
-                or result.get("finishPlace")
-                or result.get("officialPlace")
-                or ""
-            )
-            if place != "": num_boats += 1
-
+            club_name = first_field(result, _CLUB_FIELDS)
             bow = result.get("lane", "")
             # Try multiple field names for finish time
-            finish = (
-                result.get("finishTimeString")
-                or result.get("adjustedTimeString")
-                or result.get("rawTimeString")
-                or result.get("officialTimeString")
-                or ""
-            )
+            finish = first_field(result, _FINISH_FIELDS)
             # Try multiple field names for time margin
-            margin = (
-                result.get("marginString")
-                or result.get("adjustedTimeDeltaString")
-                or result.get("officialMarginString")
-                or ""
-            )
-            rows.append({
+            margin = first_field(result, _MARGIN_FIELDS)
+            # Start fetching each boat's lineup once; rows for the same boat share the future
+            lineup_key = (job_id, boat_id)
+            if boat_id and job_id and lineup_key not in lineup_futures:
+                lineup_futures[lineup_key] = _LINEUP_POOL.submit(_fetch_lineup_with_clubs, job_id, boat_id)
+            race_rows.append({
+                "event": event_name,
                 "boat_id": boat_id,
                 "boat_label": boat_label,
                 "club_name": club_name,
+                "club_name_lc": club_name.lower(),
                 "place": place,
                 "bow": bow,
                 "finish": finish,
                 "margin": margin,
                 "race_name": race_name,
+                "num_boats": num_boats,
+                "lineup": lineup_futures.get(lineup_key),
             })
-            if boat_id and job_id:
-                boat_ids.add((job_id, boat_id))
-
-        for row in rows: row["num_boats"] = num_boats
-        race_rows.extend(rows)
-
-    # Fetch all lineups in parallel for efficiency (8 concurrent requests)
-    boat_lineups = {}
-    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-        # Create futures for each unique boat
-        future_to_boat = {
-            executor.submit(fetch_lineup, job_id, boat_id): (job_id, boat_id)
-            for (job_id, boat_id) in boat_ids
-        }
-        # Collect results as they complete
-        for future in concurrent.futures.as_completed(future_to_boat):
-            _, boat_id_b = future_to_boat[future]
-            try:
-                boat_lineups[boat_id_b] = future.result()
-            except Exception:
-                boat_lineups[boat_id_b] = []
 
+    return race_rows
+
+
+def build_event_results(race_rows):
+    """Combine pending race rows with their fetched athlete lineups.
+    
+    This is the second half of parse_event_results_json(). It blocks until each
+    row's lineup future has completed.
+    
+    Args:
+        race_rows (list): Pending race rows from parse_event_races()
+        
+    Returns:
+        list: Race result dictionaries, as described in parse_event_results_json()
+    """
+    results = []
     # Build complete result records by matching race data with athlete lineups
     for info in race_rows:
-        boat_id = info["boat_id"]
+        lineup, clubs_lc = (), ()
+        if info["lineup"] is not None:
+            try:
+                lineup, clubs_lc = info["lineup"].result()
+            except Exception:
+                lineup, clubs_lc = (), ()
         club_name = info["club_name"]
+        club_name_lc = info["club_name_lc"]
         athletes = []
-        if boat_id and boat_id in boat_lineups and boat_lineups[boat_id]:
+        if lineup:
             # Filter athletes by club match, as a boat may compete for multiple clubs
-            for a in boat_lineups[boat_id]:
-                if club_name and a["club"] and club_name.lower() in a["club"].lower():
-                    athletes.append(a)
-                elif not club_name:
-                    athletes.append(a)
-            # If no club match found, use all athletes from the boat
+            if club_name_lc:
+                athletes = [a for a, club_lc in zip(lineup, clubs_lc) if club_lc and club_name_lc in club_lc]
+            # If no club is given or no club match found, use all athletes from the boat
             if not athletes:
-                athletes = boat_lineups[boat_id]
+                athletes = list(lineup)
         elif info["boat_label"]:
             # Fallback: create a pseudo-athlete entry from the boat label if no lineup available
             athletes.append({
@@ -402,7 +711,7 @@ def parse_event_results_json(json_str, job_id=None, event_name=None):
         if not athletes:
             continue
         results.append({
-            "event": event_name,
+            "event": info["event"],
             "race": info["race_name"],
             "place": info["place"],
             "bow": info["bow"],
@@ -415,6 +724,35 @@ def parse_event_results_json(json_str, job_id=None, event_name=None):
     return results
 
 
+def parse_event_results_json(json_str, job_id=None, event_name=None):
+    """Parse JSON race results and associate athletes with race finishes.
+    
+    Processes event results JSON from RegattaCentral, extracts race information,
+    fetches athlete lineups in parallel, and combines them into result records.
+    Handles missing data gracefully by trying multiple field names for the same data.
+    Equivalent to parse_event_races() followed by build_event_results().
+    
+    Args:
+        json_str (bytes or str): JSON race results from RegattaCentral
+        job_id (str, optional): The job ID (used to fetch lineups)
+        event_name (str, optional): Event name to use in results. If not provided,
+                                    extracted from the JSON data.
+        
+    Returns:
+        list: List of race result dictionaries with keys:
+              - event (str): Event name
+              - race (str): Race name (e.g., 'Heat 1', 'Final')
+              - place (str): Finishing place
+              - bow (str): Boat lane/bow position
+              - club (str): Boat club/organization
+              - athletes (list): Athletes in the boat (with seat, name, age, club)
+              - finish (str): Finish time
+              - margin (str): Margin to next boat
+              - num_boats (int): Number of boats in the race
+    """
+    return build_event_results(parse_event_races(json_str, job_id=job_id, event_name=event_name))
+
+
 def aggregate_athletes(event_results):
     """Aggregate race results by athlete name using intelligent name matching.
     
@@ -426,94 +764,88 @@ def aggregate_athletes(event_results):
     Skips entries without finish times or with place code 999 (DNS/DNF - Did Not Start/Finish).
     
     Args:
-        event_results (list): List of race result dictionaries from parse_event_results_json()
+        event_results (iterable): Race result dictionaries from parse_event_results_json(),
+                                  consumed in a single pass
         
     Returns:
-        dict: Dictionary mapping normalized athlete names (FirstName LastName) to aggregated data:
-              - races (list): List of race results for this athlete
-              - clubs (set): Set of clubs the athlete competed for
-              - names (set): Set of name variations seen for this athlete (for reference)
-              - age (str): The athlete's age
+        dict: Dictionary mapping athlete_key() grouping keys to Athlete records
     """
-    athletes = defaultdict(
-        lambda: {
-            "races": [],
-            "clubs": set(),
-            "names": set(),
-        }
-    )
+    athletes = {}
     for result in event_results:
         # Skip results without finish times or with place code 999 (DNS/DNF)
         if not result.get("finish") or str(result.get("place")).strip() == "999":
             continue
+        # Fields shared by every athlete in the boat are built once per result
+        race = {
+            "event": result["event"],
+            "race": result["race"],
+            "place": result["place"],
+            "bow": result["bow"],
+            "club": result["club"],
+            "finish": result["finish"],
+            "margin": result["margin"],
+            "num_boats": result["num_boats"],
+        }
         # Track which names we've already processed in this result to avoid duplicates
-        seen_names = set()
+        seen_keys = set()
         for athlete in result["athletes"]:
             # Normalize the athlete's name for consistent grouping
-            key = normalize_name(athlete["name"])
-            # Create a unique identifier for this race to detect exact duplicates
-            race_id = (
-                result["event"],
-                result["race"],
-                result["place"],
-                result["bow"],
-                result["club"],
-                result["finish"],
-            )
-            if (key, race_id) in seen_names:
+            name = normalize_name(athlete["name"])
+            key = athlete_key(name)
+            if key in seen_keys:
                 continue
-            seen_names.add((key, race_id))
-            athletes[key]["names"].add(athlete["name"])
-            athletes[key]["clubs"].add(athlete.get("club", ""))
-            athletes[key]["age"] = athlete.get("age", "")
-            athletes[key]["races"].append(
-                {
-                    "event": result["event"],
-                    "race": result["race"],
-                    "place": result["place"],
-                    "bow": result["bow"],
-                    "club": result["club"],
-                    "finish": result["finish"],
-                    "margin": result["margin"],
-                    "seat": athlete.get("seat", ""),
-                    "num_boats": result["num_boats"],
-                }
-            )
+            seen_keys.add(key)
+            entry = athletes.get(key)
+            if entry is None:
+                entry = athletes[key] = Athlete(name=name)
+            entry.names.add(athlete["name"])
+            entry.clubs.add(athlete.get("club", ""))
+            entry.age = athlete.get("age", "")
+            entry.races.append({**race, "seat": athlete.get("seat", "")})
     return athletes
 
 
+csv_fieldnames = (
+    "athlete_name", "age", "club", "seat", "event", "race", "place", "bow", "finish", "margin", "num_boats"
+)
+
+
+def iter_athlete_rows(athletes):
+    """Flatten aggregated athlete data into CSV rows, one at a time.
+    
+    Yields one row per race participation, in csv_fieldnames order, without building
+    the flattened table in memory.
+    
+    Args:
+        athletes (dict): Athlete records from aggregate_athletes()
+        
+    Yields:
+        tuple: Column values for one race participation of one athlete
+    """
+    # Pulls the per-race columns out of a race dict in fieldname order
+    race_columns = operator.itemgetter(*csv_fieldnames[3:])
+    for info in athletes.values():
+        # Per-athlete columns are the same on every row, so compute them once
+        athlete_columns = (info.name, info.age, ", ".join(info.clubs))
+        for race in info.races:
+            yield athlete_columns + race_columns(race)
+
+
 def write_athletes_to_csv(athletes, filename="athletes.csv"):
     """Write aggregated athlete data to a CSV file.
     
     Flattens the nested athlete/race data structure into a single CSV where each row
     represents one race participation. This format is suitable for analysis and filtering.
+    Rows are streamed from iter_athlete_rows() straight into the file.
     
     Args:
-        athletes (dict): Aggregated athlete data from aggregate_athletes()
+        athletes (dict): Athlete records from aggregate_athletes()
         filename (str, optional): Output CSV file path. Defaults to "athletes.csv"
     """
     with open(filename, "w", newline='', encoding="utf-8") as csvfile:
-        fieldnames = [
-            "athlete_name", "age", "club", "seat", "event", "race", "place", "bow", "finish", "margin", "num_boats"
-        ]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        # Flatten: one row per race participation per athlete
-        for name, info in athletes.items():
-            for race in info["races"]:
-                writer.writerow({
-                    "athlete_name": name,
-                    "age": info.get("age", ""),
-                    "club": ", ".join(info["clubs"]),
-                    "seat": race["seat"],
-                    "event": race["event"],
-                    "race": race["race"],
-                    "place": race["place"],
-                    "bow": race["bow"],
-                    "finish": race["finish"],
-                    "margin": race["margin"],
-                    "num_boats": race["num_boats"],
-                })
+        writer = csv.writer(csvfile)
+        writer.writerow(csv_fieldnames)
+        writer.writerows(iter_athlete_rows(athletes))
 
 
 def scrape_athletes_from_url(main_url):
@@ -527,48 +859,47 @@ def scrape_athletes_from_url(main_url):
         
     Returns:
         tuple: (athletes, regatta_metadata) where:
-            - athletes (dict): Dictionary mapping athlete names to aggregated data:
-                - races (list): List of race results for this athlete
-                - clubs (set): Set of clubs the athlete competed for
-                - names (set): Set of name variations for this athlete
-                - age (str): The athlete's age
+            - athletes (dict): Dictionary mapping athlete_key() grouping keys to Athlete records
             - regatta_metadata (dict): Dictionary containing regatta information:
                 - name, start_date, end_date, race_type, venue, location, host, sanctioned, entries, clubs
     """
-    # Fetch the main results page and extract event links
+    # Fetch the main results page and extract the (job_id, event_id) of each event
     html = scraper.get(main_url).text
-    event_links = get_event_links(html)
+    event_ids = [(job_id, event_id) for job_id, event_id, _ in get_event_links(html)]
     
     # Extract regatta metadata from the page
     regatta_metadata = get_regatta_metadata(html)
 
-    # Fetch and parse each event's JSON results
-    # Sequential processing to avoid overwhelming the server
-    all_event_results = []
-    for link in event_links:
-        # Extract job_id and event_id from the URL
-        m = re.search(r'job_id=(\d+)&?.*&event_id=(\d+)', link)
-        if not m:
-            continue
-        job_id, event_id = m.group(1), m.group(2)
-        # Retry up to 3 times for network resilience
-        json_str = None
-        for attempt in range(3):
-            json_str = fetch_event_results_json(job_id, event_id)
-            if json_str:
-                break
-            print(f"Attempt {attempt+1} failed for job_id={job_id}, event_id={event_id}, retrying...")
-            time.sleep(2)
-        if not json_str:
-            print(f"Skipping event {job_id=} {event_id=}: no data returned")
-            continue
-        # Small delay to be respectful to the server
-        time.sleep(1)
-        event_results = parse_event_results_json(json_str, job_id=job_id)
-        all_event_results.extend(event_results)
+    # Fetch each event's JSON results in parallel, queueing lineup fetches as they arrive
+    race_rows_by_id = {}
+    lineup_futures = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=event_workers) as executor:
+        future_to_event = {
+            executor.submit(fetch_event_results_json, job_id, event_id): (job_id, event_id)
+            for job_id, event_id in event_ids
+        }
+        for future in concurrent.futures.as_completed(future_to_event):
+            job_id, event_id = future_to_event[future]
+            json_str = future.result()
+            if not json_str:
+                logger.warning("Skipping event job_id=%s event_id=%s: no data returned", job_id, event_id)
+                continue
+            try:
+                race_rows_by_id[(job_id, event_id)] = parse_event_races(json_str, job_id=job_id, lineup_futures=lineup_futures)
+            except orjson.JSONDecodeError as e:
+                logger.warning("Skipping event job_id=%s event_id=%s: invalid JSON: %s", job_id, event_id, e)
+
+    # Wait for the lineups, keeping results in page order so the output is deterministic.
+    # Results are fed to the aggregation one event at a time rather than collected into
+    # a list first, and each event's rows are released once they have been consumed.
+    event_results = itertools.chain.from_iterable(
+        build_event_results(race_rows_by_id.pop(key))
+        for key in event_ids
+        if key in race_rows_by_id
+    )
 
     # Aggregate race results by athlete name
-    athletes = aggregate_athletes(all_event_results)
+    athletes = aggregate_athletes(event_results)
     return athletes, regatta_metadata
 
 
@@ -577,36 +908,53 @@ def main():
     
     Orchestrates the entire scraping process:
     1. Scrapes athlete data and regatta metadata from the default main results URL
-    2. Prints regatta information and a summary of athletes with their race results
+    2. Logs regatta information, plus a summary of athletes with their race results
+       when LOG_LEVEL=DEBUG
     3. Exports the flattened data to CSV
+    
+    Pass --refresh to re-download every response instead of reading the on-disk cache.
     """
+    global refresh_cache
+    parser = argparse.ArgumentParser(description="Scrape RegattaCentral results into athletes.csv")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="ignore cached responses and fetch everything from RegattaCentral again",
+    )
+    refresh_cache = parser.parse_args().refresh
+
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(threadName)s %(message)s",
+    )
+
     # Scrape athletes and regatta metadata from the default URL
     athletes, regatta_metadata = scrape_athletes_from_url(main_results_url)
     
-    # Print regatta info
-    print(f"Regatta: {regatta_metadata['name']}")
-    print(f"  Dates: {regatta_metadata['start_date']} - {regatta_metadata['end_date']}")
-    print(f"  Venue: {regatta_metadata['venue']}, {regatta_metadata['location']}")
-    print(f"  Host: {regatta_metadata['host']}")
-    print(f"  Type: {regatta_metadata['race_type']}")
-    print(f"  Entries: {regatta_metadata['entries']}, Clubs: {regatta_metadata['clubs']}")
-    print(f"  USRowing Sanctioned: {regatta_metadata['sanctioned']}")
-    print()
-    
-    # Print summary to console
-    for name, info in athletes.items():
-        print(f"Athlete: {name}")
-        print(f"  Clubs: {', '.join(info['clubs'])}")
-        print(f"  Races:")
-        for race in info["races"]:
-            print(
-                f"    - Event: {race['event']}, Race: {race['race']}, Place: {race['place']}, Club: {race['club']}, Finish: {race['finish']}, Seat: {race['seat']}, Boat Count: {race['num_boats']}"
-            )
-        print()
+    # Log regatta info
+    logger.info("Regatta: %s", regatta_metadata["name"])
+    logger.info("  Dates: %s - %s", regatta_metadata["start_date"], regatta_metadata["end_date"])
+    logger.info("  Venue: %s, %s", regatta_metadata["venue"], regatta_metadata["location"])
+    logger.info("  Host: %s", regatta_metadata["host"])
+    logger.info("  Type: %s", regatta_metadata["race_type"])
+    logger.info("  Entries: %s, Clubs: %s", regatta_metadata["entries"], regatta_metadata["clubs"])
+    logger.info("  USRowing Sanctioned: %s", regatta_metadata["sanctioned"])
+    
+    # The per-athlete summary is large, so only build it when debug output is requested
+    if logger.isEnabledFor(logging.DEBUG):
+        for info in athletes.values():
+            logger.debug("Athlete: %s", info.name)
+            logger.debug("  Clubs: %s", ", ".join(info.clubs))
+            logger.debug("  Races:")
+            for race in info.races:
+                logger.debug(
+                    "    - Event: %s, Race: %s, Place: %s, Club: %s, Finish: %s, Seat: %s, Boat Count: %s",
+                    race["event"], race["race"], race["place"], race["club"], race["finish"], race["seat"], race["num_boats"],
+                )
     
     # Export to CSV for further analysis
     write_athletes_to_csv(athletes)
-    print("Wrote athlete data to athletes.csv")
+    logger.info("Wrote athlete data to athletes.csv")
 if __name__ == "__main__":
     main()
 